@@ -19,10 +19,11 @@ class JominiParser:
     @cached_property
     def _localization_dict(self):
         localization_dict = {}
+        line_regex = re.compile(r'\s*([^#\s:]+):\d?\s*"(.*)"[^"]*')
         for path in self.localization_folder_iterator:
             with path.open(encoding='utf-8-sig') as f:
                 for line in f:
-                    match = re.fullmatch(r'\s*([^#\s:]+):\d?\s*"(.*)"[^"]*', line)
+                    match = line_regex.fullmatch(line)
                     if match:
                         localization_dict[match.group(1)] = match.group(2)
         return localization_dict
@@ -271,7 +271,7 @@ class AttributeEntity:
             setattr(self, key, f(attributes))
 
     @classmethod
-    @lru_cache(maxsize=1)
+    @lru_cache(maxsize=None)
     def all_annotations(cls) -> ChainMap:
         """Returns a dictionary-like ChainMap that includes annotations for all
            attributes defined in cls or inherited from superclasses."""
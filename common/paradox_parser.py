@@ -27,9 +27,24 @@ class ParsingWorkaround:
     """
     replacement_regexes: dict[str, str]
 
+    # the compiled replacement_regexes of each subclass
+    _compiled_replacement_regexes: dict[type, list[tuple[re.Pattern, str]]] = {}
+
+    def _compile_replacement_regexes(self) -> list[tuple[re.Pattern, str]]:
+        return [(re.compile(pattern), replacement) for pattern, replacement in self.replacement_regexes.items()]
+
+    def _get_compiled_replacement_regexes(self) -> list[tuple[re.Pattern, str]]:
+        if 'replacement_regexes' in vars(self):
+            # regexes which were set on the instance can't be shared with the other instances of the class
+            return self._compile_replacement_regexes()
+        cls = type(self)
+        if cls not in self._compiled_replacement_regexes:
+            self._compiled_replacement_regexes[cls] = self._compile_replacement_regexes()
+        return self._compiled_replacement_regexes[cls]
+
     def apply_to_string(self, file_contents):
-        for pattern, replacement in self.replacement_regexes.items():
-            file_contents = re.sub(pattern, replacement, file_contents)
+        for pattern, replacement in self._get_compiled_replacement_regexes():
+            file_contents = pattern.sub(replacement, file_contents)
         return file_contents
 
 
@@ -1,5 +1,4 @@
 import re
-from collections import OrderedDict
 from operator import attrgetter
 
 import sys
@@ -11,6 +10,10 @@ from millennia.text_formatter import MillenniaWikiTextFormatter
 
 class TableGenerator(MillenniaFileGenerator):
 
+    final_age_infopedia_header_re = re.compile(r"^''[^']*?Final Age]]''\n*")
+    multiple_linebreaks_re = re.compile(r'\n{2,}')
+    menu_link_re = re.compile(r'\[\[MENU_[A-Z_]*\|([^]]*]])')
+
     @cached_property
     def formatter(self) -> MillenniaWikiTextFormatter:
         return self.parser.formatter
@@ -20,16 +23,17 @@ class TableGenerator(MillenniaFileGenerator):
         return self.parser.localize(key, localization_category, localization_suffix, default)
 
     def generate_infopedia_tables(self):
-        topics = sorted(self.parser.infopedia_topics.values(), key=attrgetter('display_name'))
+        topics_by_type = {topic_type: [] for topic_type in self.parser.infopedia_topic_types.values()}
+        for topic in sorted(self.parser.infopedia_topics.values(), key=attrgetter('display_name')):
+            topics_by_type[topic.topicType].append(topic)
         result = []
-        for topic_type in self.parser.infopedia_topic_types.values():
+        for topic_type, topics in topics_by_type.items():
             result.append(f'== {topic_type.display_name} ==')
             for topic in topics:
-                if topic.topicType == topic_type:
-                    result.append(f'=== {topic} ===')
-                    result.append(f'<section begin=autogenerated_infopedia_{topic.name} />')
-                    result.append(topic.text)
-                    result.append(f'<section end=autogenerated_infopedia_{topic.name} />')
+                result.extend([f'=== {topic} ===',
+                               f'<section begin=autogenerated_infopedia_{topic.name} />',
+                               topic.text,
+                               f'<section end=autogenerated_infopedia_{topic.name} />'])
 
         return result
 
@@ -47,9 +51,21 @@ class TableGenerator(MillenniaFileGenerator):
             notes.append(f'Progressive cost factor: {progressive_cost}')
         return self.create_wiki_list(notes)
 
+    @cached_property
+    def _domain_and_culture_powers(self) -> tuple[list[DomainPower], list[DomainPower]]:
+        """the localized domain powers split into domain powers and culture powers in one pass"""
+        domain_powers = []
+        culture_powers = []
+        for power in self.parser.domain_powers.values():
+            if power.has_localized_display_name:
+                if power.is_culture_power():
+                    culture_powers.append(power)
+                else:
+                    domain_powers.append(power)
+        return domain_powers, culture_powers
+
     def generate_domain_power_table(self):
-        powers = [power for power in self.parser.domain_powers.values() if power.has_localized_display_name and not power.is_culture_power()]
-        powers = sorted(powers, key=attrgetter('domain', 'cost.value', 'display_name'))
+        powers = sorted(self._domain_and_culture_powers[0], key=attrgetter('domain', 'cost.value', 'display_name'))
 
         data = [{
             'id': power.display_name,
@@ -69,8 +85,7 @@ class TableGenerator(MillenniaFileGenerator):
         return result
 
     def generate_culture_power_table(self):
-        powers = [power for power in self.parser.domain_powers.values() if power.has_localized_display_name and power.is_culture_power()]
-        powers = sorted(powers, key=attrgetter('domain', 'display_name'))
+        powers = sorted(self._domain_and_culture_powers[1], key=attrgetter('domain', 'display_name'))
 
         data = [{
             'id': power.display_name,
@@ -109,7 +124,8 @@ class TableGenerator(MillenniaFileGenerator):
             else:
                 if requirement.has_localized_display_name:  # ignore non-localized stuff
                     strings.append(requirement.get_wiki_file_tag('24px'))
-        return list(OrderedDict.fromkeys(strings))
+        # dicts keep the insertion order, so this removes duplicates without changing the order
+        return list(dict.fromkeys(strings))
 
     def generate_improvement_table(self):
         result = []
@@ -123,18 +139,23 @@ class TableGenerator(MillenniaFileGenerator):
         return re.sub(r'^(Castle|Colony|Standard) Outpost Improvement\n?', '', improvement.description)
 
     def get_improvement_sections(self):
-        grouped_improvements = unsorted_groupby([improvement for improvement in self.parser.improvements.values()
-                             if improvement.has_localized_display_name
-                             and not improvement.tags.has('RebuildableTown')
-                             and not improvement.is_outpost_specialization],
+        # split the improvements in one pass. Outpost specializations get their own sections after the grouped improvements
+        improvements_to_group = []
+        outpost_specializations = []
+        for improvement in self.parser.improvements.values():
+            if improvement.is_outpost_specialization:
+                if improvement.display_name != 'Outpost':
+                    outpost_specializations.append(improvement)
+            elif improvement.has_localized_display_name and not improvement.tags.has('RebuildableTown'):
+                improvements_to_group.append(improvement)
+        grouped_improvements = unsorted_groupby(improvements_to_group,
                                                 key=lambda improvement:
                                                 'outpost_improvements' if improvement.is_outpost_improvement
                                                 else f'improvements_{improvement.category}' if improvement.category
                                                 else 'improvements_other')
         sections = {k: list(v) for k,v in grouped_improvements}
-        for improvement in self.parser.improvements.values():
-            if improvement.is_outpost_specialization and improvement.display_name != 'Outpost':
-                sections[improvement.display_name.lower().replace(' ', '_')] = [improvement]
+        for improvement in outpost_specializations:
+            sections[improvement.section_name] = [improvement]
         results = {}
         for title, improvements in sections.items():
             improvements = sorted(improvements, key=self.entity_sort_key)
@@ -223,19 +244,23 @@ class TableGenerator(MillenniaFileGenerator):
                  'Unit': 'Other units',  # fallback
                  'ALL': '',
                  }
-        for unit_type in unit_types.values():
+        units_by_primary_type = {unit_type: [] for unit_type in unit_types.values()}
+        for unit in all_units:
+            units_by_primary_type[unit.primary_type].append(unit)
+        air_secondary_types = list(self.secondary_types.keys())
+        other_secondary_types = [tag for tag in air_secondary_types if tag not in ['ActInAirCombatRounds', 'ActInBombingRound']]
+        for unit_type, units_of_type in units_by_primary_type.items():
 
             units_by_secondary_type = {typ: list() for typ in self.secondary_types}
             if unit_type.tag in ['SETTLER', 'TILEHARVEST']:
-                units_by_secondary_type['ALL'] = [unit for unit in all_units if unit.primary_type == unit_type]
+                units_by_secondary_type['ALL'] = units_of_type
             else:
-                secondary_types = list(self.secondary_types.keys())
-                if unit_type.tag != 'AirUnit':
-                    secondary_types.remove('ActInAirCombatRounds')
-                    secondary_types.remove('ActInBombingRound')
-                for unit in all_units:
-                    if unit.primary_type == unit_type:
-                        units_by_secondary_type[unit.get_first_matching_tag(secondary_types)].append(unit)
+                if unit_type.tag == 'AirUnit':
+                    secondary_types = air_secondary_types
+                else:
+                    secondary_types = other_secondary_types
+                for unit in units_of_type:
+                    units_by_secondary_type[unit.get_first_matching_tag(secondary_types)].append(unit)
             for secondary_type_tag, secondary_type_heading in self.secondary_types.items():
                 units = units_by_secondary_type[secondary_type_tag]
                 if units:
@@ -348,14 +373,14 @@ class TableGenerator(MillenniaFileGenerator):
 
     def _strip_unnecssary_information_from_ages_infopedia(self, infopedia_text: str, age: Age):
         infopedia_text = re.sub(r"^''[^']*?" + age.type_loc + f"]]''\n*", '', infopedia_text)
-        infopedia_text = re.sub(r"^''[^']*?Final Age]]''\n*", '', infopedia_text)
-        infopedia_text = re.sub(r'\n{2,}', '\n\n', infopedia_text)
+        infopedia_text = self.final_age_infopedia_header_re.sub('', infopedia_text)
+        infopedia_text = self.multiple_linebreaks_re.sub('\n\n', infopedia_text)
         return infopedia_text
 
     def get_ages_sections(self):
         results = {}
         for age in sorted(self.parser.ages.values(), key=attrgetter('order')):
-            name = age.display_name.lower().replace(' ', '_')
+            name = age.section_name
             # sorted_techs = sorted(age.technologies.values(), key=lambda tech: 1 if tech.is_age_advance else 0)  # sort advances after the normal techs
             sorted_techs = [tech for tech in age.technologies.values() if not tech.is_age_advance]
             for section, contents in {
@@ -373,21 +398,21 @@ class TableGenerator(MillenniaFileGenerator):
         result = []
         sections = {name: self.surround_with_autogenerated_section(name, contents) for name, contents in self.get_ages_sections().items()}
         for age in sorted(self.parser.ages.values(), key=attrgetter('order')):
-            name = age.display_name.lower().replace(' ', '_')
-            result.append(f'== {age.display_name} ==')
-            result.append(f"'''''{age.type_loc}'''''")
-            result.append(f'[[File:{age.display_name}.png|320px|right]]')
-            result.append(f'=== Infopedia description ===')
-            result.append(sections[f'infopedia_{name}'])
-            result.append(f'=== Start unlocks ===')
-            result.append(sections[f'unlocks_{name}'])
-            result.append(f'=== Start effects ===')
-            result.append(sections[f'effects_{name}'])
-            result.append(f'=== Research options ===')
-            result.append(sections[f'technologies_{name}'])
+            name = age.section_name
+            result.extend([f'== {age.display_name} ==',
+                           f"'''''{age.type_loc}'''''",
+                           f'[[File:{age.display_name}.png|320px|right]]',
+                           '=== Infopedia description ===',
+                           sections[f'infopedia_{name}'],
+                           '=== Start unlocks ===',
+                           sections[f'unlocks_{name}'],
+                           '=== Start effects ===',
+                           sections[f'effects_{name}'],
+                           '=== Research options ===',
+                           sections[f'technologies_{name}']])
             if f'advances_{name}' in sections:
-                result.append(f'=== Advances ===')
-                result.append(sections[f'advances_{name}'])
+                result.extend(['=== Advances ===',
+                               sections[f'advances_{name}']])
 
         return result
 
@@ -423,7 +448,7 @@ class TableGenerator(MillenniaFileGenerator):
 
     def get_domain_specializations_sections(self, spirit: DomainSpecialization):
         results = {}
-        name = spirit.display_name.lower().replace(' ', '_')
+        name = spirit.section_name
         sorted_techs = spirit.technologies.values()
         remove_buffs_from_description = re.compile(r'[\n\s]*' + spirit.display_name + r' Government Buffs(\n((^\s*$)|(^\s{8}.*$)))*', re.MULTILINE)
         remove_dlc_from_infopedia = re.compile(r'\s*\n+\s*\{\{icon\|(' + '|'.join(dlc.display_name.lower() for dlc in self.parser.dlcs.values()) + r')}}\s*$')
@@ -476,21 +501,22 @@ class TableGenerator(MillenniaFileGenerator):
             result.update(self.get_domain_specializations_sections(government))
         return result
 
+    @cached_property
+    def _ideals_infopedia_section(self) -> str:
+        """the ideals section is the same on the national spirits and the governments page"""
+        return self.surround_with_autogenerated_section('infopedia_CONCEPT_IDEALS', self.parser.infopedia_topics['CONCEPT_IDEALS'].text)
+
     def generate_domain_specialization_list(self, domain_type: str, entities: dict[str, DomainSpecialization], main_article):
         results = [self.get_version_header(),
                    f'== {domain_type} ==',
                    self.surround_with_autogenerated_section(f'infopedia_{main_article}', self.parser.infopedia_topics[main_article].text),
                    '== Ideals ==',
-                   self.surround_with_autogenerated_section('infopedia_CONCEPT_IDEALS', self.parser.infopedia_topics['CONCEPT_IDEALS'].text)
+                   self._ideals_infopedia_section
                    ]
         grouped_spirits = {}
 
-        for name, spirit in entities.items():
-            if spirit.age not in grouped_spirits:
-                grouped_spirits[spirit.age] = {}
-            if spirit.resource not in grouped_spirits[spirit.age]:
-                grouped_spirits[spirit.age][spirit.resource] = []
-            grouped_spirits[spirit.age][spirit.resource].append(spirit)
+        for spirit in entities.values():
+            grouped_spirits.setdefault(spirit.age, {}).setdefault(spirit.resource, []).append(spirit)
         for age, resources in sorted(grouped_spirits.items()):
             results.append(f'== Age {age}==')
             for resource, spirits in resources.items():
@@ -498,25 +524,25 @@ class TableGenerator(MillenniaFileGenerator):
                     results.append(f'== {resource.display_name.removesuffix(" XP")}==')
                 for spirit in spirits:
                     sections = self.get_domain_specializations_sections(spirit)
-                    name = spirit.display_name.lower().replace(' ', '_')
-                    results.append(f'=== {spirit} ===')
-                    results.append(f'[[File:{spirit.get_wiki_image_filename()}|300px|right]]')  # TODO: change size back to 320px after the old images left the cache
-                    results.append(f'; Description')
-                    results.append(self.surround_with_autogenerated_section(f'description_{name}', sections[f'description_{name}']))
+                    name = spirit.section_name
+                    results.extend([f'=== {spirit} ===',
+                                    f'[[File:{spirit.get_wiki_image_filename()}|300px|right]]',  # TODO: change size back to 320px after the old images left the cache
+                                    '; Description',
+                                    self.surround_with_autogenerated_section(f'description_{name}', sections[f'description_{name}'])])
                     if f'infopedia_{name}' in sections:
-                        results.append(f'; Infopedia')
-                        results.append(self.surround_with_autogenerated_section(f'infopedia_{name}', sections[f'infopedia_{name}']))
+                        results.extend(['; Infopedia',
+                                        self.surround_with_autogenerated_section(f'infopedia_{name}', sections[f'infopedia_{name}'])])
                     if f'requirements_{name}' in sections and name != 'space_agency':  # TODO: space agency requirements only apply to some of the effects
-                        results.append(f'; Requirements')
-                        results.append(self.surround_with_autogenerated_section(f'requirements_{name}', sections[f'requirements_{name}']))
-                    results.append(f'; Effects')
-                    results.append(f'These effects are applied when selecting {spirit}')
-                    results.append(self.surround_with_autogenerated_section(f'effects_{name}', sections[f'effects_{name}']))
-                    results.append(f'; Ideals')
-                    results.append(self.surround_with_autogenerated_section(f'ideals_{name}', sections[f'ideals_{name}']))
-        results.append('== References ==')
-        results.append('<references />')
-        results.append('[[Category:Government]]')
+                        results.extend(['; Requirements',
+                                        self.surround_with_autogenerated_section(f'requirements_{name}', sections[f'requirements_{name}'])])
+                    results.extend(['; Effects',
+                                    f'These effects are applied when selecting {spirit}',
+                                    self.surround_with_autogenerated_section(f'effects_{name}', sections[f'effects_{name}']),
+                                    '; Ideals',
+                                    self.surround_with_autogenerated_section(f'ideals_{name}', sections[f'ideals_{name}'])])
+        results.extend(['== References ==',
+                        '<references />',
+                        '[[Category:Government]]'])
         return results
 
     def generate_goods_table(self):
@@ -568,14 +594,17 @@ class TableGenerator(MillenniaFileGenerator):
                 effects = card.get_effects(include_unlocks=True, recursive=True, group_by_choice=True)
                 if len(effects) > MAX_CHOICE_COLUMNS:
                     print(f'More than {MAX_CHOICE_COLUMNS} choices in {card.name}')
-                for choice_number in range(MAX_CHOICE_COLUMNS):
-                    if len(effects) > choice_number:
-                        effects_text = self.create_wiki_list(effects[choice_number])
-                        if card.choice_localisations[choice_number]:
-                            effects_text = f'{self.formatter.quote(card.choice_localisations[choice_number])}\n{effects_text}'
-                    else:
-                        effects_text = ''
+                choice_localisations = card.choice_localisations
+                for choice_number, choice_effects in effects.items():
+                    if choice_number >= MAX_CHOICE_COLUMNS:
+                        break
+                    effects_text = self.create_wiki_list(choice_effects)
+                    if choice_localisations[choice_number]:
+                        effects_text = f'{self.formatter.quote(choice_localisations[choice_number])}\n{effects_text}'
                     row[f'Choice {choice_number+1}'] = effects_text
+                # fill the remaining columns, because all rows need the same columns
+                for choice_number in range(len(effects), MAX_CHOICE_COLUMNS):
+                    row[f'Choice {choice_number+1}'] = ''
                 data.append(row)
             results[section] = (self.get_SVersion_header(scope='table') + '\n'
                                 + self.make_wiki_table(data, table_classes=['mildtable'], one_line_per_cell=True, row_id_key='id', remove_empty_columns=True))
@@ -612,7 +641,7 @@ class TableGenerator(MillenniaFileGenerator):
         data = [{
             'id': bonus.display_name,
             'Bonus': bonus.display_name,
-            'Effect': f'<section begin={bonus.transclude_section_name} />' + re.sub(r'\[\[MENU_[A-Z_]*\|([^]]*]])', '', self.formatter.convert_to_wikitext(
+            'Effect': f'<section begin={bonus.transclude_section_name} />' + self.menu_link_re.sub('', self.formatter.convert_to_wikitext(
                 bonus.description)) + f'<section end={bonus.transclude_section_name} />',
         } for bonus in self.parser.startup_bonuses.values()]
         return (self.get_SVersion_header() + '\n'
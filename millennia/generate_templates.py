@@ -1,13 +1,25 @@
 import sys
-from itertools import groupby
+from functools import cached_property, lru_cache
+from itertools import chain, groupby
 from operator import attrgetter
+from types import MappingProxyType
 
 from millennia.game import MillenniaFileGenerator
-from millennia.millennia_lib import CardUsageWithTarget
+from millennia.millennia_lib import CardUsageWithTarget, Technology
 
 
 class TemplateGenerator(MillenniaFileGenerator):
 
+    # used by generate_technology_template_all_in_one with the mapping from get_tech_data
+    tech_tooltip_template = (
+        '<div class="tooltip">[[File:Technology %(name)s.png|24px|link=%(name)s]] %(name)s'
+        '<div class="tooltiptext" style="color: #A2A2A3; background: linear-gradient(to bottom, #0e111d,#172333); border: solid #7C582C; border-radius: 10px; width: 350px; padding: 5px;">'
+        '<div style="float:left; margin-right: 5px;">[[File:Technology %(name)s.png|48px]]</div><div><span style="color: #499fc1;">\'\'\'%(name)s\'\'\'</span><br>'
+        'Base cost: <span style="color: #499fc1;>[[File:Resource knowledge.png|Knowledge|24px]] \'\'\'%(cost)d\'\'\'</span></div>'
+        '<hr style="border-top: 1px solid #8a7f7a;"><span class="plainlist">%(effects)s</span>'
+        '<span class="plainlist">Requires%(age)s</span>'
+        '</div></div>')
+
     def create_html_list(self, elements, no_list_with_one_element=False):
         if len(elements) == 0 or elements == [[]]:
             return ''
@@ -50,39 +62,36 @@ class TemplateGenerator(MillenniaFileGenerator):
         else:
             return list_results
 
+    @cached_property
+    def technologies_without_advances_sorted_by_name(self) -> list[Technology]:
+        """the technologies which are not age advances, sorted by name"""
+        return sorted([tech for tech in self.parser.technologies.values() if not tech.is_age_advance], key=attrgetter('name'))
+
     def generate_technology_template_all_in_one(self):
-        techs = sorted(self.parser.technologies.values(), key=attrgetter('name'))
+        techs = self.technologies_without_advances_sorted_by_name
         result = ['<includeonly>{{#switch:{{{1}}}']
         default_case = '| #default = <span style="color: red; font-size: 11px;">(unrecognized string “{{{1}}}” for [[Template:Technology]])</span>[[Category:Pages with unrecognized template strings]]'
         for tech in techs:
-            if tech.is_age_advance:
-                continue
             data = self.get_tech_data(tech)
-            text = '<div class="tooltip">[[File:Technology %s.png|24px|link=%s]] %s' % (data['name'], data['name'], data['name'])
-            text += '<div class="tooltiptext" style="color: #A2A2A3; background: linear-gradient(to bottom, #0e111d,#172333); border: solid #7C582C; border-radius: 10px; width: 350px; padding: 5px;">'
-            text += '<div style="float:left; margin-right: 5px;">[[File:Technology %s.png|48px]]</div><div><span style="color: #499fc1;">\'\'\'%s\'\'\'</span><br>' %( data['name'], data['name'])
-            text += 'Base cost: <span style="color: #499fc1;>[[File:Resource knowledge.png|Knowledge|24px]] \'\'\'%d\'\'\'</span></div>' % data['cost']
-            text += '<hr style="border-top: 1px solid #8a7f7a;"><span class="plainlist">%s</span>' % data['effects']
-            text += '<span class="plainlist">Requires%s</span>' % data['age']
-            text += '</div></div>'
+            text = self.tech_tooltip_template % data
             result.append(f'| {tech.display_name} = {text}')
         result.append(default_case)
         result.append('}}</includeonly><noinclude>{{template doc}}')
         result.append('[[Category:Templates]]</noinclude>')
         return result
 
-    @staticmethod
-    def escape_lua_string(string: str):
+    # all characters are replaced in one pass, so the backslashes of the escaped quotes are not escaped again
+    lua_string_replacements = str.maketrans({
+        '\\': '\\\\',
+        '"': '\\"',
+        "'": "\\'",
+        '\n': '<br>',
+    })
+
+    @classmethod
+    def escape_lua_string(cls, string: str):
         """incomplete. only replaces backslashes and quotes and newlines for now"""
-        replacements = {
-            '\\': '\\\\',
-            '"': '\\"',
-            "'": "\\'",
-            '\n': '<br>',
-        }
-        for old, new in replacements.items():
-            string = string.replace(old, new)
-        return string
+        return string.translate(cls.lua_string_replacements)
 
     def generate_technology_module(self):
         result = ['''local p = {
@@ -90,9 +99,7 @@ class TemplateGenerator(MillenniaFileGenerator):
 }
 local techs = p.techs
 ''']
-        for tech in sorted(self.parser.technologies.values(), key=attrgetter('name')):
-            if tech.is_age_advance:
-                continue
+        for tech in self.technologies_without_advances_sorted_by_name:
             data = self.get_tech_data(tech)
             parameters = [f'{parameter} = {value}' if isinstance(value, int) else f'{parameter} = "{self.escape_lua_string(value)}"' for parameter, value in data.items()]
             result.append(f'techs["{tech.display_name}"] = {{{", ".join(parameters)}}}')
@@ -100,7 +107,8 @@ local techs = p.techs
         result.append('return p')
         return result
 
-    def get_tech_data(self, tech):
+    @lru_cache(maxsize=None)
+    def get_tech_data(self, tech) -> MappingProxyType:
         data = {
             'name': tech.display_name,
             'effects': (f'Effects:{self.create_html_list([tech.other_effects])}' if tech.other_effects else '') +
@@ -109,7 +117,7 @@ local techs = p.techs
             'age': (f':' if len(tech.ages) == 1 else f'&nbsp;any of:') + self.create_html_list([[age.get_wiki_link_with_icon() for age in tech.ages]]),
             'cost': tech.cost,
         }
-        return data
+        return MappingProxyType(data)
 
     def generate_flat_terrain_improvements_list(self):
         return 'Flat Terrain Improvements:{{collapse|' + self.create_wiki_list(sorted(self.parser.get_entities_by_tag('BuildRequirementTag-OpenTerrain', self.parser.improvements), key=attrgetter('display_name')), format_with_icon=True) + '\n}}'
@@ -123,7 +131,7 @@ local techs = p.techs
 
     def get_card_usage_sections(self) -> dict[str, str]:
         result = {}
-        for action in list(self.parser.data_link_actions.values()) + list(self.parser.action_cards.values()) + list(self.parser.played_cards_from_tech.values()):
+        for action in chain(self.parser.data_link_actions.values(), self.parser.action_cards.values(), self.parser.played_cards_from_tech.values()):
             if isinstance(action, CardUsageWithTarget):
                 target_text = action.card.format_effect_target(action.target, ignore_default_targets=True)
                 if target_text:
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Iterator, Callable
 from dataclasses import dataclass
 from decimal import Decimal
-from functools import cached_property
+from functools import cached_property, lru_cache
 from itertools import groupby
 from pprint import pprint, pformat
 
@@ -13,6 +13,7 @@ from common.paradox_parser import Tree
 from millennia.game import millenniagame
 
 
+@lru_cache(maxsize=None)
 def convert_xml_tag_to_python_attribute(s: str):
     """ lowercase the first letter"""
     return s[0].lower() + s[1:]
@@ -20,7 +21,11 @@ def convert_xml_tag_to_python_attribute(s: str):
 
 def unsorted_groupby(iterable, key):
     """
-    wrapper around itertools.groupby which works even if values with the same keys are non-consecutive
+    like itertools.groupby, but works even if values with the same keys are non-consecutive
+
+    the groups are returned sorted by their keys and each group is a list which keeps the order of the iterable.
+    The elements are grouped in a dict. If a key is unhashable (e.g. the dict which Data.get returns for nested
+    attributes), the elements are sorted and grouped with itertools.groupby instead
 
       iterable
         Elements to divide into groups according to the key function.
@@ -29,7 +34,14 @@ def unsorted_groupby(iterable, key):
         If the key function is not specified or is None, the element itself
         is used for grouping.
     """
-    return groupby(sorted(iterable, key=key), key=key)
+    elements = list(iterable)
+    groups = {}
+    try:
+        for element in elements:
+            groups.setdefault(element if key is None else key(element), []).append(element)
+    except TypeError:  # unhashable key
+        return [(group_key, list(group)) for group_key, group in groupby(sorted(elements, key=key), key=key)]
+    return sorted(groups.items(), key=lambda group: group[0])
 
 
 class MillenniaIconMixin(IconMixin):
@@ -134,6 +146,12 @@ class Resource(NameableEntity):
         else:
             self.icon = self.display_name.lower()
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def from_name(name: str) -> 'Resource':
+        """returns the same object for each name"""
+        return Resource(name)
+
     @cached_property
     def positive_is_bad(self):
         return self.name in self.positive_is_bad_overrides
@@ -150,7 +168,7 @@ class ResourceValue:
     @classmethod
     def parse(cls, resource_value: str) -> 'ResourceValue':
         resource, value = resource_value.split(',')
-        return cls(Resource(resource), int(value))
+        return cls(Resource.from_name(resource), int(value))
 
     def format(self, icon_only=False):
         if self.resource is None:
@@ -212,14 +230,19 @@ class NamedAttributeEntity(AttributeEntity, MillenniaIconMixin):
         return hash(self.name)
 
     def __eq__(self, other):
+        if other.__class__ is self.__class__:  # the common case in sets and list lookups
+            return self.name == other.name
         if other is None:
             return False
         if isinstance(other, str):
             return other == self.display_name or other == self.name
-        if hasattr(other, 'name'):
-            return self.name == other.name
-        else:
-            return False
+        # self.name is never None, so this is False for objects without a name
+        return self.name == getattr(other, 'name', None)
+
+    @cached_property
+    def section_name(self) -> str:
+        """the display name in the format which is used in the names of autogenerated sections"""
+        return self.display_name.lower().replace(' ', '_')
 
     def _get_display_name(self, data):
         display_name = millenniagame.parser.localize(self.name, self._localization_category, self._localization_suffix, return_none_instead_of_default=True)
@@ -245,7 +268,10 @@ class Storage(ABC):
             self.unparsed_entries = self.deduplicate(unparsed_entries)
 
     def deduplicate(self, unparsed_data):
-        unduplicated_dict = {data.partition(',')[0]: data.partition(',')[2] for data in unparsed_data}
+        unduplicated_dict = {}
+        for data in unparsed_data:
+            key, _separator, value = data.partition(',')
+            unduplicated_dict[key] = value
         unduplicated_list = [f'{key},{value}' if value != '' else key for key, value in unduplicated_dict.items()]
         return unduplicated_list
 
@@ -259,17 +285,31 @@ class Storage(ABC):
 
 class Tags(Storage):
 
-    def get(self, tag: str):
-        multiple_tags = []
+    @cached_property
+    def _lookup_tables(self) -> tuple[dict[str, bool | str], dict[str, list[str]]]:
+        """maps every tag which get() can match to its result
+
+        the first dict has the results for tags which match a whole entry or the part before a colon. The earliest
+        entry wins like in a linear search. The second dict has the values for tags which are followed by a minus"""
+        single_results = {}
+        multiple_results = {}
         for entry in self.unparsed_entries:
-            if entry == tag:
-                return True
-            if entry.startswith(f'{tag}:'):
-                return entry.partition(':')[2]
-            if entry.startswith(f'{tag}-'):
-                multiple_tags.append(entry.partition('-')[2])
-        if len(multiple_tags) > 0:
-            return multiple_tags
+            single_results.setdefault(entry, True)
+            colon_value = entry.partition(':')[2]
+            minus_value = entry.partition('-')[2]
+            for i, char in enumerate(entry):
+                if char == ':':
+                    single_results.setdefault(entry[:i], colon_value)
+                elif char == '-':
+                    multiple_results.setdefault(entry[:i], []).append(minus_value)
+        return single_results, multiple_results
+
+    def get(self, tag: str):
+        single_results, multiple_results = self._lookup_tables
+        if tag in single_results:
+            return single_results[tag]
+        elif tag in multiple_results:
+            return list(multiple_results[tag])
         else:
             return None
 
@@ -290,16 +330,19 @@ class Data(Storage):
         if not self.unparsed_entries:
             return None
         attributes = {}
+        colon_prefix = f'{tag}:'
+        comma_prefix = f'{tag},'
+        attribute_prefix = f'{tag}{first_tag_separator}'
         for entry in self.unparsed_entries:
             if entry == tag:
                 return True
-            if entry.startswith(f'{tag}:'):
+            if entry.startswith(colon_prefix):
                 return entry.partition(':')[2]
-            if entry.startswith(f'{tag},'):
+            if entry.startswith(comma_prefix):
                 return entry.partition(',')[2]
 
-            if entry.startswith(f'{tag}{first_tag_separator}'):
-                entry = f'{tag}-' + entry.removeprefix(f'{tag}{first_tag_separator}')
+            if entry.startswith(attribute_prefix):
+                entry = f'{tag}-' + entry.removeprefix(attribute_prefix)
                 key, value = entry.split(',')
                 self._split_keys_by_minus(key, value, attributes)
         if attributes:
@@ -378,51 +421,28 @@ class MillenniaEntity(NamedAttributeEntity):
     @cached_property
     def upgrades(self):
         upgrades = set()
-        for line in self.upgrade_line_tiers:
-            tier = self.upgrade_line_tiers[line]
-            possible_upgrades = [entity for entity in millenniagame.parser.entities.values() if
-                                 line in entity.upgrade_line_tiers
-                                 and entity.upgrade_line_tiers[line] >= tier + 1
-                                 and entity.has_localized_display_name  # assume unlocalized units dont exist
-                                 ]
-
-            while possible_upgrades:
-                next_tier_upgrades = {upgrade for upgrade in possible_upgrades if upgrade.upgrade_line_tiers[line] == tier + 1}
-                if len(next_tier_upgrades) > 0:
-                    upgrades.update(next_tier_upgrades)
-                    break
-                else:
-                    tier += 1
-                if tier > 20:
-                    raise Exception(f'Reached tier 20 without finding upgrades from the same tier in "{self.display_name}"')
+        entities_by_upgrade_line = millenniagame.parser.entities_by_upgrade_line
+        for line, tier in self.upgrade_line_tiers.items():
+            possible_upgrades = [entity for entity in entities_by_upgrade_line.get(line, [])
+                                 if entity.upgrade_line_tiers[line] >= tier + 1]
+            if possible_upgrades:
+                # upgrades go to the next tier which exists in the line. Tiers can be skipped
+                next_tier = min(upgrade.upgrade_line_tiers[line] for upgrade in possible_upgrades)
+                upgrades.update(upgrade for upgrade in possible_upgrades if upgrade.upgrade_line_tiers[line] == next_tier)
         return sorted(upgrades, key=lambda upgrade: upgrade.display_name)
 
     @cached_property
     def unlocked_by(self):
         # TODO: other ways to unlock
-        result = [tech for tech in (
-                list(millenniagame.parser.technologies.values()) +
-                [age for age in millenniagame.parser.ages.values()] +
-                list(millenniagame.parser.domain_technologies.values()) +
-                [deck for deck in millenniagame.parser.domain_decks.values()] +
-                [card for deck in millenniagame.parser.event_cards.values() for card in deck.values()] +
-                [reward for faction in millenniagame.parser.factions.values() for reward in faction.rewards.values()] +
-                list(millenniagame.parser.megaproject_stages.values())
-        ) if self.name in tech.unlock_names]
+        result = list(millenniagame.parser.unlocked_by_entity_name.get(self.name, []))
         if self.name == 'B_PARTHENON':  # TODO: find a better way to discover or present this information
             result.append(millenniagame.parser.ages['TECHAGE3_HEROES'])
         return sorted(result, key=lambda tech: tech.display_name)
 
     @cached_property
     def spawned_by(self):
-        result = [tech for tech in (list(millenniagame.parser.technologies.values()) + [age for age in millenniagame.parser.ages.values()] + list(
-            millenniagame.parser.domain_technologies.values()) + [card for deck in millenniagame.parser.event_cards.values() for card in deck.values()] +
-                                    list(millenniagame.parser.unit_actions.values()))
-                  if self.name in tech.spawns
-                  # filter out things without a display name, because they are either not used or triggered by another effect in which
-                  # case that other effect is already listed
-                  and tech.has_localized_display_name]
-        spawn_powers = [power for power in millenniagame.parser.domain_powers.values() if self.name in power.spawns]
+        result = list(millenniagame.parser.spawned_by_entity_name.get(self.name, []))
+        spawn_powers = millenniagame.parser.domain_powers_by_spawned_entity_name.get(self.name, [])
         filtered_powers = list(spawn_powers)
         for power in spawn_powers:
             for linked_power in power.all_linked_powers_recursive:
@@ -447,13 +467,12 @@ class MillenniaEntity(NamedAttributeEntity):
         for entry in self.startingData.get_as_list(''):
             tag = entry.pop(0)
             value = entry.pop()
-            if tag in ['DefaultBonusValue',
+            if tag in {'DefaultBonusValue',
                        'OutpostImprovementRestrictionTag',  # TODO: this one might be useful
                        'UpkeepCategory', 'ConstructionCost', 'EntityPrefab', 'EntityAudioEvent', 'UpgradeLine', 'ImprovementSort', 'FilterAge',
                        'SourceOverlayImageName', 'SourceOverlayTooltip', 'HelpTopicOnBuild', 'ReligionRenameFormat',
                        'CVAttachment', 'IdleAnim',
-                       ] or tag.startswith('Goods') or tag.startswith('Res') or tag.startswith('Workable') or tag.startswith('ConvertGoods') or tag.startswith(
-                'AI'):
+                       } or tag.startswith(('Goods', 'Res', 'Workable', 'ConvertGoods', 'AI')):
                 continue
             if tag in ignored_data:
                 continue
@@ -483,7 +502,7 @@ class MillenniaEntity(NamedAttributeEntity):
 
         # TODO: parse tags (e.g. RequireReligion )
         for tag in self.tags.unparsed_entries:
-            if (tag in ['Building', 'CityBuilding', 'CityBuildingConstructed', 'Improvement',
+            if (tag in {'Building', 'CityBuilding', 'CityBuildingConstructed', 'Improvement',
                         'VentureCapitalists', 'SpartansFortifications', 'University', 'TrainingCamp', 'AquaticBuilding', 'SultanBuilding',
                         'MilitaryBasePresent', 'Housing', 'GreatLibrary', 'Palace',
                         'ImprovedByNets',
@@ -493,8 +512,8 @@ class MillenniaEntity(NamedAttributeEntity):
                         'NoWorkerAssignmentOnCreation',
                         # 'UpkeepCategory', 'ConstructionCost', 'EntityPrefab', 'EntityAudioEvent', 'UpgradeLine', 'ImprovementSort', 'FilterAge',
                         # 'SourceOverlayImageName', 'SourceOverlayTooltip', 'HelpTopicOnBuild', 'ReligionRenameFormat'
-                        ] or tag.startswith('AI') or tag.startswith('CapitalAge') or tag.startswith('Tooltip') or tag.startswith('BuildRequirement')
-                    or tag.startswith('ImprovementCategory')  # improvement category might be useful to sort them
+                        } or tag.startswith(('AI', 'CapitalAge', 'Tooltip', 'BuildRequirement',
+                                             'ImprovementCategory'))  # improvement category might be useful to sort them
                     or tag.endswith('TownBonus') or (tag.endswith('Present') and ':' not in tag)
                     or 'sound' in tag.lower()
             ):
@@ -601,10 +620,10 @@ class MillenniaEntity(NamedAttributeEntity):
             return 'Requires [[religion]]'
         elif tag.startswith('RequiredBuildingTag:'):
             building_tag = tag.removeprefix('RequiredBuildingTag:')
-            return f'Requires {formatter.join_with_comma_and_or([building.get_wiki_link() for building in parser.buildings.values() if building.tags.has(building_tag)])}'
+            return f'Requires {formatter.join_with_comma_and_or([building.get_wiki_link() for building in parser.get_buildings_by_tag(building_tag)])}'
         elif tag.startswith('RequiredImprovementTag:'):
             improvement_tag = tag.removeprefix('RequiredImprovementTag:')
-            return f'Requires {formatter.join_with_comma_and_or([improvement.get_wiki_link() for improvement in parser.improvements.values() if improvement.tags.has(improvement_tag)])}'
+            return f'Requires {formatter.join_with_comma_and_or([improvement.get_wiki_link() for improvement in parser.get_improvements_by_tag(improvement_tag)])}'
         elif tag == 'RelocateOnPlayerOwnerChange':
             return 'Relocate when owner changes'
         elif tag.startswith('DataLinkAction:'):
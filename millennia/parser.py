@@ -1,7 +1,8 @@
-import copy
 import operator
+import pickle
 import warnings
 import xml.etree.ElementTree as ET
+from functools import lru_cache
 from typing import TypeVar, Type, Callable
 
 import xmltodict
@@ -77,6 +78,7 @@ class MillenniaParser:
             else:
                 return self.unity_reader.localizations.get(key, default)
 
+    @lru_cache(maxsize=None)
     def localize_upgrade_line(self, upgrade_line: str) -> str:
         loc = self.localize(upgrade_line, 'Game-UpgradeLine-UpgradeLine')
         loc = self.formatter.strip_formatting(loc)
@@ -149,7 +151,9 @@ class MillenniaParser:
                 ]:
                     continue
                 while 'Import' in entry:  # to deal with imports which have an import as well
-                    import_entry = copy.deepcopy(self.unparsed_attributes_for_import[entry['Import']])
+                    # deep copy of the imported entry
+                    import_entry = pickle.loads(pickle.dumps(self.unparsed_attributes_for_import[entry['Import']],
+                                                             protocol=pickle.HIGHEST_PROTOCOL))
                     del entry['Import']
                     import_entry.update(entry)
                     entry = import_entry
@@ -388,7 +392,7 @@ class MillenniaParser:
         result = {}
         for name, cards in self.parse_decks_from_folder('text/domains', group_by_deck=True).items():
             base_card = cards[f'{name}-AUTOMATIC']
-            attributes = {'name': name, 'cards': cards, 'age': base_card.tags.get('DomainAge'), 'resource': Resource(base_card.tags.get('DomainResource'))}
+            attributes = {'name': name, 'cards': cards, 'age': base_card.tags.get('DomainAge'), 'resource': Resource.from_name(base_card.tags.get('DomainResource'))}
             if attributes['resource'].name == 'ResDomainGovernment':
                 cls = Government
                 attributes['tier'] = base_card.tags.get('DomainTier')
@@ -441,6 +445,16 @@ class MillenniaParser:
     def get_terrains_by_tag(self, tag: str) -> list[Terrain]:
         return self.get_entities_by_tag(tag, self.terrains)
 
+    @lru_cache(maxsize=None)
+    def get_buildings_by_tag(self, tag: str) -> tuple[Building, ...]:
+        """all buildings which have the tag"""
+        return tuple(building for building in self.buildings.values() if building.tags.has(tag))
+
+    @lru_cache(maxsize=None)
+    def get_improvements_by_tag(self, tag: str) -> tuple[Improvement, ...]:
+        """all improvements which have the tag"""
+        return tuple(improvement for improvement in self.improvements.values() if improvement.tags.has(tag))
+
     def get_entities_by_tag(self, tag: str, entities: list[MillenniaEntity] | dict[str, MillenniaEntity] = None) -> list[MillenniaEntity]:
         """search entities for entities with a given tag. If entities is None, self.all_entities is searched"""
         tag = tag.removeprefix('+')
@@ -568,6 +582,8 @@ class MillenniaParser:
             faction_reward.faction = results[faction_name]
             faction_reward.tier = tier
             faction_reward.display_name = f'{faction.display_name} faction reward {tier}'
+            # section_name could have been cached with the old display name
+            faction_reward.__dict__.pop('section_name', None)
             faction.rewards[tier] = faction_reward
 
         return results
@@ -694,6 +710,56 @@ class MillenniaParser:
                         actions[card_name] = CardUsage(card_name, card, [entity])
         return actions
 
+    @cached_property
+    def unlocked_by_entity_name(self) -> dict[str, list[NamedAttributeEntity]]:
+        """maps entity names to the technologies, cards etc. which unlock them"""
+        result = {}
+        for unlocker in (list(self.technologies.values()) +
+                         list(self.ages.values()) +
+                         list(self.domain_technologies.values()) +
+                         list(self.domain_decks.values()) +
+                         [card for deck in self.event_cards.values() for card in deck.values()] +
+                         [reward for faction in self.factions.values() for reward in faction.rewards.values()] +
+                         list(self.megaproject_stages.values())):
+            for name in dict.fromkeys(unlocker.unlock_names):
+                result.setdefault(name, []).append(unlocker)
+        return result
+
+    @cached_property
+    def spawned_by_entity_name(self) -> dict[str, list[NamedAttributeEntity]]:
+        """maps entity names to the technologies, cards and unit actions which spawn them (see MillenniaEntity.spawned_by)"""
+        result = {}
+        for spawner in (list(self.technologies.values()) +
+                        list(self.ages.values()) +
+                        list(self.domain_technologies.values()) +
+                        [card for deck in self.event_cards.values() for card in deck.values()] +
+                        list(self.unit_actions.values())):
+            # filter out things without a display name, because they are either not used or triggered by another effect in which
+            # case that other effect is already listed
+            if spawner.has_localized_display_name:
+                for name in dict.fromkeys(spawner.spawns):
+                    result.setdefault(name, []).append(spawner)
+        return result
+
+    @cached_property
+    def domain_powers_by_spawned_entity_name(self) -> dict[str, list[DomainPower]]:
+        """maps entity names to the domain powers which spawn them (see MillenniaEntity.spawned_by)"""
+        result = {}
+        for power in self.domain_powers.values():
+            for name in dict.fromkeys(power.spawns):
+                result.setdefault(name, []).append(power)
+        return result
+
+    @cached_property
+    def entities_by_upgrade_line(self) -> dict[str, list[MillenniaEntity]]:
+        """maps upgrade lines to the localized entities which are part of them (see MillenniaEntity.upgrades)"""
+        result = {}
+        for entity in self.entities.values():
+            if entity.has_localized_display_name:  # assume unlocalized units dont exist
+                for line in entity.upgrade_line_tiers:
+                    result.setdefault(line, []).append(entity)
+        return result
+
 
 class LazyObject:
 
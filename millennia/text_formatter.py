@@ -1,6 +1,7 @@
 import re
 import sys
 from decimal import Decimal
+from functools import lru_cache
 
 from common.wiki import WikiTextFormatter
 from millennia.game import millenniagame
@@ -9,6 +10,7 @@ from millennia.millennia_lib import Resource
 
 class MillenniaWikiTextFormatter(WikiTextFormatter):
 
+    @lru_cache(maxsize=None)
     def convert_to_wikitext(self, xml_string: str):
         replacements = {
             r'<sprite name="IconLineBreak">': '\n\n',  # I have no idea why this is an icon
@@ -130,7 +132,7 @@ class MillenniaWikiTextFormatter(WikiTextFormatter):
 
     def format_resource(self, resource: str | Resource, value=None, cost=False, icon_only=False, add_plus=False):
         if not isinstance(resource, Resource):
-            resource = Resource(resource)
+            resource = Resource.from_name(resource)
         if value is None:
             value_str = ''
         elif isinstance(value, str) and not self.is_number(value):
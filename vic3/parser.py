@@ -3,6 +3,7 @@ import sys
 from typing import Callable, TypeVar, Type
 
 from PyHelpersForPDXWikis.localsettings import VIC3DIR
+from common.cache import disk_cache
 from common.jomini_parser import JominiParser
 from common.paradox_parser import ParadoxParser, ParsingWorkaround, QuestionmarkEqualsWorkaround
 from vic3.vic3lib import *
@@ -220,10 +221,12 @@ class Vic3Parser(JominiParser):
         return Vic3WikiTextFormatter()
 
     @cached_property
+    @disk_cache(game=vic3game)
     def defines(self):
         return self.parser.parse_folder_as_one_file('common/defines').merge_duplicate_keys()
 
     @cached_property
+    @disk_cache(game=vic3game)
     def script_values(self):
         return self.parser.parse_folder_as_one_file('common/script_values').merge_duplicate_keys()
 
@@ -274,22 +277,26 @@ class Vic3Parser(JominiParser):
         return tags
 
     @cached_property
-    def event_releasable_tags(self):
-        """tags which get created by create_country"""
-        tags = set()
+    def _event_created_and_formed_tags(self) -> tuple[set[str], set[str]]:
+        """the tags which get created by create_country and the tags from change_tag in the events"""
+        created_tags = set()
+        formed_tags = set()
         for file, data in self.parser.parse_files('events/**/*.txt'):
             for create_country_section in data.find_all_recursively('create_country'):
-                tags.add(create_country_section['tag'])
-        return tags
+                created_tags.add(create_country_section['tag'])
+            for tag in data.find_all_recursively('change_tag'):
+                formed_tags.add(tag)
+        return created_tags, formed_tags
+
+    @cached_property
+    def event_releasable_tags(self):
+        """tags which get created by create_country"""
+        return self._event_created_and_formed_tags[0]
 
     @cached_property
     def event_formed_tags(self):
         """tags which get formed with change_tag"""
-        tags = set()
-        for file, data in self.parser.parse_files('events/**/*.txt'):
-            for tag in data.find_all_recursively('change_tag'):
-                tags.add(tag)
-        return tags
+        return self._event_created_and_formed_tags[1]
 
     @cached_property
     def dynamic_country_names(self) -> dict[str, list[str]]:
@@ -386,8 +393,9 @@ class Vic3Parser(JominiParser):
         return self.parse_nameable_entities('common/modifier_type_definitions', ModifierType)
 
     def get_modifier_type_or_default(self, modifier_name: str) -> ModifierType:
-        if modifier_name in self.modifier_types:
-            return self.modifier_types[modifier_name]
+        modifier_type = self.modifier_types.get(modifier_name)
+        if modifier_type is not None:
+            return modifier_type
         else:
             # print(f'Warning: use default for unknown modifier "{modifier_name}"', file=sys.stderr)
             modifier_type = ModifierType(modifier_name, self.localize(modifier_name))
@@ -430,7 +438,7 @@ class Vic3Parser(JominiParser):
     @cached_property
     def named_modifiers(self) -> dict[str, NamedModifier]:
         return self.parse_advanced_entities('common/modifiers', NamedModifier, extra_data_functions={
-            'modifiers': lambda name, data: self._parse_modifier_data(Tree({name: value for name, value in data if name != 'icon'}))
+            'modifiers': lambda name, data: self._parse_modifier_data(data.filter_elements(lambda key, value: key != 'icon'))
         })
 
     @cached_property
@@ -466,12 +474,14 @@ class Vic3Parser(JominiParser):
 
     @cached_property
     def buildings(self) -> dict[str, Building]:
+        building_groups = self.building_groups
+        script_values = self.script_values
         all_buildings = self.parse_advanced_entities('common/buildings', Building,
                                                      transform_value_functions={
                                                          'building_group': lambda building_group:
-                                                         self.building_groups[building_group],
+                                                         building_groups[building_group],
                                                          'required_construction': lambda required_construction:
-                                                         self.script_values[required_construction],
+                                                         script_values[required_construction],
                                                      },
                                                      extra_data_functions={
                                                          'location': self._get_monument_location
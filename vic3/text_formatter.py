@@ -9,6 +9,17 @@ from vic3.vic3lib import AdvancedEntity
 
 class Vic3WikiTextFormatter(WikiTextFormatter):
 
+    optional_localization_re = re.compile(r"\[\s*(SelectLocalization|AddLocalizationIf)\s*\(\s*GetPlayer\.IsValid\s*,\s*'(?P<loc_key>[^']*)'[^]]*]")
+    multiple_linebreaks_re = re.compile(r'(\\n){2,}')
+    linebreak_re = re.compile(r'\\n')
+    formatting_marker_re = re.compile(r'#(\S+) ([^#]+)#!')
+    icon_re = re.compile(r'@([^!]*)!')
+    define_re = re.compile(r"\[\s*GetDefine\s*\(\s*'(?P<category>[^']*)'\s*,\s*'(?P<define>[^']*)'\s*\)\s*\|\s*(?P<formatting>[-vK0+=%]+)\s*]")
+    get_name_re = re.compile(r"\[\s*Get[a-zA-Z_]+\s*\(\s*'(?P<loc_key>[^']+)'\s*\).GetName\s*]")
+    law_group_name_re = re.compile(r"\[\s*GetLawType\s*\(\s*'(?P<law_key>[^']+)'\s*\).GetGroup.GetName\s*]")
+    interest_group_name_re = re.compile(r"\[\s*GetInterestGroupVariant\s*\(\s*'(?P<ig_key>[^']+)'\s*,\s*GetPlayer\s*\).GetNameWithCountryVariant\s*]")
+    nested_localization_re = re.compile(r'\$([^$]*)\$')
+
     def __init__(self):
         self.parser = vic3game.parser
 
@@ -178,12 +189,11 @@ class Vic3WikiTextFormatter(WikiTextFormatter):
             return self.parser.localize(match.group('loc_key'))
 
     def apply_localization_formatting(self, text: str) -> str:
-        text = re.sub(r"\[\s*(SelectLocalization|AddLocalizationIf)\s*\(\s*GetPlayer\.IsValid\s*,\s*'(?P<loc_key>[^']*)'[^]]*]",
-                      self._add_optional_localization, text)
+        text = self.optional_localization_re.sub(self._add_optional_localization, text)
 
         # various special cases
-        text = re.sub(r'(\\n){2,}', '\n\n', text)
-        text = re.sub(r'\\n', '<br />', text)
+        text = self.multiple_linebreaks_re.sub('\n\n', text)
+        text = self.linebreak_re.sub('<br />', text)
         text = text.replace(r"\\'", "'")
 
         # to support nested formatting, we loop as long as something changes
@@ -192,27 +202,25 @@ class Vic3WikiTextFormatter(WikiTextFormatter):
         while previous_text != new_text:
             previous_text = new_text
             # only matches the inner formatting. The others will be done in future loops
-            new_text = re.sub(r'#(\S+) ([^#]+)#!', self._apply_formatting_markers, previous_text)
+            new_text = self.formatting_marker_re.sub(self._apply_formatting_markers, previous_text)
 
-        text = re.sub(r'@([^!]*)!', self._replace_icons, new_text)
-        text = re.sub(r"\[\s*GetDefine\s*\(\s*'(?P<category>[^']*)'\s*,\s*'(?P<define>[^']*)'\s*\)\s*\|\s*(?P<formatting>[-vK0+=%]+)\s*]",
-                      self._replace_defines, text)
-        text = re.sub(r"\[\s*Get[a-zA-Z_]+\s*\(\s*'(?P<loc_key>[^']+)'\s*\).GetName\s*]",
-                      lambda match: self.parser.localize(match.group('loc_key')), text)
-        text = re.sub(r"\[\s*GetLawType\s*\(\s*'(?P<law_key>[^']+)'\s*\).GetGroup.GetName\s*]",
-                      lambda match: self.parser.laws[match.group('law_key')].group.display_name, text)
-        text = re.sub(r"\[\s*GetInterestGroupVariant\s*\(\s*'(?P<ig_key>[^']+)'\s*,\s*GetPlayer\s*\).GetNameWithCountryVariant\s*]",
-                      lambda match: self.parser.interest_groups[match.group('ig_key')].display_name, text)
+        text = self.icon_re.sub(self._replace_icons, new_text)
+        text = self.define_re.sub(self._replace_defines, text)
+        localize = self.parser.localize
+        text = self.get_name_re.sub(lambda match: localize(match.group('loc_key')), text)
+        text = self.law_group_name_re.sub(lambda match: self.parser.laws[match.group('law_key')].group.display_name, text)
+        text = self.interest_group_name_re.sub(lambda match: self.parser.interest_groups[match.group('ig_key')].display_name, text)
         return text
 
     def resolve_nested_localizations(self, text: str):
         previous_text = None
         new_text = text
+        localize = self.parser.localize
         # some localizations use other localizations themselves.
         # so we replace till nothing changes anymore (and hope that there is no loop)
         while previous_text != new_text:
             previous_text = new_text
-            new_text = re.sub(r'\$([^$]*)\$', lambda match: self.parser.localize(match.group(1)), previous_text)
+            new_text = self.nested_localization_re.sub(lambda match: localize(match.group(1)), previous_text)
 
         return new_text
 